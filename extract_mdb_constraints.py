@@ -4,15 +4,33 @@
 """
 
 import sys
-import io
-# 设置标准输出编码为UTF-8，避免Windows控制台中文乱码
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+# 设置标准输出编码为UTF-8，避免Windows控制台中文乱码；
+# 使用块缓冲，逐字段的进度输出不再每次都触发系统调用
+sys.stdout.reconfigure(encoding='utf-8', line_buffering=False, write_through=False)
 
 import pypyodbc
 import pandas as pd
+try:
+    # 可选依赖（仅Windows）：通过DAO读取表的RecordCount
+    import win32com.client
+except ImportError:
+    win32com = None
+try:
+    # 可选依赖：C实现的JSON序列化，大文件明显快于标准库json
+    import orjson
+except ImportError:
+    orjson = None
+import numpy as np
 from pathlib import Path
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import csv
 import json
 from datetime import datetime
+import logging
+import multiprocessing
+
+log = logging.getLogger(__name__)
 
 # 配置
 MDB_FILES = {
@@ -63,6 +81,14 @@ FIELDS_STATS_ONLY = [
     'LEVEL7_CNT'
 ]
 
+# 整数类型字段（读取时需保持整数，避免含NULL时被转为float）
+INTEGER_TYPES = {'BYTE', 'SMALLINT', 'INTEGER', 'COUNTER', 'BIGINT'}
+
+
+def in_field_list(field_name, field_list):
+    """判断字段是否在配置列表中（实际字段名大小写不统一，如student_count，按大写匹配）"""
+    return field_name.upper() in field_list
+
 
 def connect_to_mdb(mdb_path):
     """连接到MDB数据库"""
@@ -79,6 +105,35 @@ def connect_to_mdb(mdb_path):
         return None
 
 
+def get_record_counts(mdb_path):
+    """通过DAO读取各表的RecordCount（Jet自行维护的计数器，无需扫描表）
+    
+    需要pywin32与Access数据库引擎（DAO.DBEngine.120）；不可用时返回空字典，
+    调用方应退回到COUNT(*)。
+    """
+    if win32com is None:
+        return {}
+    
+    try:
+        engine = win32com.client.Dispatch("DAO.DBEngine.120")
+        db = engine.OpenDatabase(mdb_path, False, True)  # 非独占、只读
+    except Exception as _:
+        return {}
+    
+    record_counts = {}
+    try:
+        for table_def in db.TableDefs:
+            # 链接表的RecordCount为-1，跳过
+            if not table_def.Name.startswith('MSys') and table_def.RecordCount >= 0:
+                record_counts[table_def.Name] = table_def.RecordCount
+    except Exception as _:
+        pass
+    finally:
+        db.Close()
+    
+    return record_counts
+
+
 def get_table_schema(conn, table_name):
     """获取表结构信息"""
     cursor = conn.cursor()
@@ -170,131 +225,160 @@ def get_table_constraints(conn, table_name):
     }
 
 
-def perform_rule_checks(conn, table_name, is_assessment=False):
-    """业务规则校验：
-    - 对评估表：
+def count_rule_mismatches(df):
+    """业务规则校验（对评估表的一个数据块计数）：
       1) tested_student_cnt == sum(level1..levelN)
       2) AP 达标: proficient == level3+4+5
       3) IB 达标: proficient == level4+5+6+7
-    返回不一致记录计数与比例。
+    df的列名须为小写。返回
+    [总行数, levels不一致数, AP行数, AP不一致数, IB行数, IB不一致数]。
     """
-    cursor = conn.cursor()
+    level_cols = [f'level{i}_cnt' for i in range(1, 8)]
+    count_cols = ['tested_student_cnt', 'proficient_student_cnt'] + level_cols
 
-    results = {}
-    if not is_assessment:
-        return results
+    # 将文本'-'与NULL转0，其余文本转数字
+    nums = pd.DataFrame({
+        c: pd.to_numeric(df[c].replace('-', 0), errors='coerce').fillna(0).astype('int32')
+        for c in count_cols
+    })
 
-    # 将文本'-'与NULL转0，使用VAL函数将文本转数字
-    lvl = lambda c: f"IIF([{c}]='-', 0, VAL([{c}]))"
+    levels = nums[level_cols]
+    is_ap = (df['apib_ind'] == 'AP').to_numpy()
+    is_ib = (df['apib_ind'] == 'IB').to_numpy()
 
-    try:
-        # 1) levels求和一致性
-        sum_levels = f"{lvl('level1_cnt')}+{lvl('level2_cnt')}+{lvl('level3_cnt')}+{lvl('level4_cnt')}+{lvl('level5_cnt')}+{lvl('level6_cnt')}+{lvl('level7_cnt')}"
-        q_total = f"SELECT COUNT(*) FROM [{table_name}]"
-        cursor.execute(q_total)
-        total_rows = cursor.fetchone()[0]
-
-        q_mismatch_levels = f"""
-            SELECT COUNT(*)
-            FROM [{table_name}]
-            WHERE VAL([{ 'tested_student_cnt' }]) <> ({sum_levels})
-        """
-        cursor.execute(q_mismatch_levels)
-        levels_mismatch = cursor.fetchone()[0]
-
-        results['levels_sum_check'] = {
-            'total_rows': total_rows,
-            'mismatch_rows': levels_mismatch,
-            'mismatch_percentage': round(levels_mismatch / total_rows * 100, 4) if total_rows else 0.0
-        }
-    except Exception as e:
-        results['levels_sum_check_error'] = str(e)
+    # 1) levels求和一致性
+    levels_mismatch = (nums['tested_student_cnt'] != levels.sum(axis=1)).to_numpy()
+    # 2) AP 达标（APIB_IND='AP'）：proficient == level3+4+5
+    ap_mismatch = is_ap & (nums['proficient_student_cnt'] != levels[level_cols[2:5]].sum(axis=1)).to_numpy()
+    # 3) IB 达标（APIB_IND='IB'）：proficient == level4+5+6+7
+    ib_mismatch = is_ib & (nums['proficient_student_cnt'] != levels[level_cols[3:7]].sum(axis=1)).to_numpy()
 
-    try:
-        # 2) AP 达标（APIB_IND='AP'）：proficient == level3+4+5
-        ap_sum = f"{lvl('level3_cnt')}+{lvl('level4_cnt')}+{lvl('level5_cnt')}"
-        q_ap_total = f"SELECT COUNT(*) FROM [{table_name}] WHERE [APIB_IND]='AP'"
-        cursor.execute(q_ap_total)
-        ap_total = cursor.fetchone()[0]
-        q_ap_mismatch = f"""
-            SELECT COUNT(*)
-            FROM [{table_name}]
-            WHERE [APIB_IND]='AP'
-              AND VAL([{ 'proficient_student_cnt' }]) <> ({ap_sum})
-        """
-        cursor.execute(q_ap_mismatch)
-        ap_mismatch = cursor.fetchone()[0]
-        results['ap_proficient_check'] = {
-            'total_rows': ap_total,
-            'mismatch_rows': ap_mismatch,
-            'mismatch_percentage': round(ap_mismatch / ap_total * 100, 4) if ap_total else 0.0
-        }
-    except Exception as e:
-        results['ap_proficient_check_error'] = str(e)
+    return np.array([
+        len(df), levels_mismatch.sum(),
+        is_ap.sum(), ap_mismatch.sum(),
+        is_ib.sum(), ib_mismatch.sum(),
+    ], dtype=np.int64)
 
-    try:
-        # 3) IB 达标（APIB_IND='IB'）：proficient == level4+5+6+7
-        ib_sum = f"{lvl('level4_cnt')}+{lvl('level5_cnt')}+{lvl('level6_cnt')}+{lvl('level7_cnt')}"
-        q_ib_total = f"SELECT COUNT(*) FROM [{table_name}] WHERE [APIB_IND]='IB'"
-        cursor.execute(q_ib_total)
-        ib_total = cursor.fetchone()[0]
-        q_ib_mismatch = f"""
-            SELECT COUNT(*)
-            FROM [{table_name}]
-            WHERE [APIB_IND]='IB'
-              AND VAL([{ 'proficient_student_cnt' }]) <> ({ib_sum})
-        """
-        cursor.execute(q_ib_mismatch)
-        ib_mismatch = cursor.fetchone()[0]
-        results['ib_proficient_check'] = {
-            'total_rows': ib_total,
-            'mismatch_rows': ib_mismatch,
-            'mismatch_percentage': round(ib_mismatch / ib_total * 100, 4) if ib_total else 0.0
-        }
-    except Exception as e:
-        results['ib_proficient_check_error'] = str(e)
 
+def summarize_rule_checks(rule_counts):
+    """将累计的校验计数转换为不一致记录计数与比例"""
+    total_rows, levels_mismatch, ap_total, ap_mismatch, ib_total, ib_mismatch = (int(v) for v in rule_counts)
+
+    results = {}
+    for key, total, mismatch in (
+        ('levels_sum_check', total_rows, levels_mismatch),
+        ('ap_proficient_check', ap_total, ap_mismatch),
+        ('ib_proficient_check', ib_total, ib_mismatch),
+    ):
+        results[key] = {
+            'total_rows': total,
+            'mismatch_rows': mismatch,
+            'mismatch_percentage': round(mismatch / total * 100, 4) if total else 0.0
+        }
     return results
 
 
-def analyze_field_values(conn, table_name, field_name):
-    """分析字段的值分布"""
+def scan_table(conn, table_name, schema, check_rules=False, chunksize=100_000):
+    """单次读取整张表（游标fetchmany分块转为DataFrame），同时完成所有统计
+    
+    - 所有字段：非空记录数
+    - 需要值分布的字段：值计数（Counter）
+    - 仅统计字段（FIELDS_STATS_ONLY）：最小/最大值与数值合计，不统计值分布
+    - check_rules为True时（评估表）：业务规则校验
+    
+    整张表只读一次，代替逐字段的COUNT/GROUP BY查询与Jet逐行执行的IIF/VAL。
+    """
+    field_names = [c['column_name'] for c in schema]
+    stats_only = [name for name in field_names if in_field_list(name, FIELDS_STATS_ONLY)]
+    # 含NULL的整数列会被pandas推断为float，转回可空整数以保持值的原样
+    int_fields = [c['column_name'] for c in schema if str(c['data_type']).upper() in INTEGER_TYPES]
+
+    total_rows = 0
+    non_null_counts = dict.fromkeys(field_names, 0)
+    counters = {name: Counter() for name in field_names if name not in stats_only}
+    min_max_sum = {name: [None, None, 0.0] for name in stats_only}
+    rule_counts = np.zeros(6, dtype=np.int64)
+    rule_error = None
+
+    # 直接用游标分批读取：pd.read_sql对非SQLAlchemy连接每次调用都会发出UserWarning
     cursor = conn.cursor()
+    column_list = ", ".join(f"[{name}]" for name in field_names)
+    cursor.execute(f"SELECT {column_list} FROM [{table_name}]")
+    while True:
+        rows = cursor.fetchmany(chunksize)
+        if not rows:
+            break
+        # 驱动返回的列名大小写不固定，按位置对应回schema中的字段名；
+        # coerce_float=False保留Decimal/Currency原值，不转为float
+        chunk = pd.DataFrame.from_records(rows, columns=field_names, coerce_float=False)
+        for name in int_fields:
+            chunk[name] = chunk[name].astype('Int64')
+
+        total_rows += len(chunk)
+        chunk_non_null = chunk.notna().sum()
+        for name in field_names:
+            non_null = int(chunk_non_null[name])
+            non_null_counts[name] += non_null
+            if name in counters:
+                values = chunk[name].value_counts()
+                counters[name].update(dict(zip(values.index.tolist(), values.tolist())))
+                if non_null < len(chunk):
+                    counters[name][None] += len(chunk) - non_null
+            elif non_null:
+                column = chunk[name].dropna()
+                stats = min_max_sum[name]
+                lo, hi = column.min(), column.max()
+                stats[0] = lo if stats[0] is None else min(stats[0], lo)
+                stats[1] = hi if stats[1] is None else max(stats[1], hi)
+                # 文本转数字，'-'与无法转换的值按0计
+                stats[2] += float(pd.to_numeric(column, errors='coerce').fillna(0).sum())
+
+        if check_rules and rule_error is None:
+            try:
+                rule_counts += count_rule_mismatches(chunk.rename(columns=str.lower))
+            except Exception as e:
+                rule_error = str(e)
+
+    rule_checks = {}
+    if check_rules:
+        rule_checks = {'rule_checks_error': rule_error} if rule_error else summarize_rule_checks(rule_counts)
+
+    return {
+        'total_rows': total_rows,
+        'non_null_counts': non_null_counts,
+        'counters': counters,
+        'min_max_sum': min_max_sum,
+        'rule_checks': rule_checks,
+    }
+
+
+def finalize_field_values(counter, total_rows, non_null_count, top_n=None):
+    """根据内存中的计数结果生成字段统计信息（含按出现次数降序的值分布）
     
-    try:
-        # 基本统计
-        query_total = f"SELECT COUNT(*) as total FROM [{table_name}]"
-        cursor.execute(query_total)
-        total_rows = cursor.fetchone()[0]
-        
-        # 非空值统计
-        query_non_null = f"SELECT COUNT([{field_name}]) as non_null FROM [{table_name}]"
-        cursor.execute(query_non_null)
-        non_null_count = cursor.fetchone()[0]
-        
-        # 获取所有唯一值及其出现次数（同时得到distinct_count）
-        # Access不支持COUNT(DISTINCT)，但GROUP BY可以同时获取唯一值和数量
-        query_values = f"""
-            SELECT [{field_name}], COUNT(*) as count 
-            FROM [{table_name}] 
-            GROUP BY [{field_name}]
-            ORDER BY COUNT(*) DESC
-        """
-        cursor.execute(query_values)
-        values_distribution = cursor.fetchall()
-        
-        # 从GROUP BY结果中获取唯一值数量
-        distinct_count = len(values_distribution)
-        
-        return {
-            'total_rows': total_rows,
-            'non_null_count': non_null_count,
-            'null_count': total_rows - non_null_count,
-            'distinct_count': distinct_count,
-            'values_distribution': [(str(row[0]) if row[0] is not None else 'NULL', row[1]) for row in values_distribution]
-        }
-    except Exception as e:
-        return {'error': str(e)}
+    top_n不为None时只取出现次数最多的top_n个值（most_common内部用堆，
+    不必对全部唯一值排序并物化）；distinct_count始终为完整的唯一值数量。
+    """
+    values_distribution = counter.most_common(top_n)
+    return {
+        'total_rows': total_rows,
+        'non_null_count': non_null_count,
+        'null_count': total_rows - non_null_count,
+        'distinct_count': len(counter),
+        'values_distribution': [(str(value) if value is not None else 'NULL', count) for value, count in values_distribution]
+    }
+
+
+def finalize_field_stats(total_rows, non_null_count, min_value, max_value, numeric_sum):
+    """仅统计字段的汇总信息（不枚举值，因此不统计唯一值数量）"""
+    return {
+        'total_rows': total_rows,
+        'non_null_count': non_null_count,
+        'null_count': total_rows - non_null_count,
+        'distinct_count': None,
+        'min_value': str(min_value) if min_value is not None else None,
+        'max_value': str(max_value) if max_value is not None else None,
+        'numeric_sum': numeric_sum
+    }
 
 
 def extract_all_constraints(mdb_path, db_name):
@@ -318,6 +402,9 @@ def extract_all_constraints(mdb_path, db_name):
             tables.append(table_name)
     print(f"\n[完成] 找到 {len(tables)} 个表: {tables}")
     
+    # DAO记录数无需扫描表，可在耗时的全表读取之前先显示
+    record_counts = get_record_counts(mdb_path)
+    
     database_info = {
         'database_name': db_name,
         'mdb_path': mdb_path,
@@ -325,16 +412,27 @@ def extract_all_constraints(mdb_path, db_name):
     }
     
     for table_name in tables:
-        print(f"\n📋 分析表: {table_name}")
+        # 仅在表边界刷新输出
+        print(f"\n📋 分析表: {table_name}", flush=True)
         
         # 获取表结构
         schema = get_table_schema(conn, table_name)
         print(f"  ├─ 字段数量: {len(schema)}")
         
-        # 获取记录数
-        cursor.execute(f"SELECT COUNT(*) FROM [{table_name}]")
-        row_count = cursor.fetchone()[0]
-        print(f"  ├─ 记录数量: {row_count:,}")
+        if table_name in record_counts:
+            print(f"  ├─ 记录数量: {record_counts[table_name]:,}")
+        # 全表读取前刷新，使字段数量与记录数量在扫描期间即可看到
+        sys.stdout.flush()
+        
+        # 一次读取整张表，得到记录数、各字段统计与规则校验
+        try:
+            table_stats = scan_table(conn, table_name, schema, check_rules=(db_name == 'assessment'))
+        except Exception as e:
+            print(f"  └─ [错误] 读取表失败: {e}")
+            continue
+        row_count = table_stats['total_rows']
+        if table_name not in record_counts:
+            print(f"  ├─ 记录数量: {row_count:,}")
         
         # 采集表级约束
         constraints = get_table_constraints(conn, table_name)
@@ -350,56 +448,71 @@ def extract_all_constraints(mdb_path, db_name):
         # 分析每个字段
         for col_info in schema:
             field_name = col_info['column_name']
-            print(f"  ├─ 分析字段: {field_name}", end='')
-            
-            field_stats = analyze_field_values(conn, table_name, field_name)
             
             # 判断是否需要完整枚举
-            enumerate_all = field_name in FIELDS_TO_ENUMERATE_COMPLETELY
-            enumerate_limited = field_name in FIELDS_TO_ENUMERATE_WITH_LIMIT
+            enumerate_all = in_field_list(field_name, FIELDS_TO_ENUMERATE_COMPLETELY)
+            enumerate_limited = in_field_list(field_name, FIELDS_TO_ENUMERATE_WITH_LIMIT)
             
-            if 'error' not in field_stats:
-                distinct_count = field_stats['distinct_count']
-                print(f" - {distinct_count} 个唯一值", end='')
-                
-                field_analysis = {
-                    'data_type': col_info['data_type'],
-                    'column_size': col_info['column_size'],
-                    'nullable': col_info['nullable'],
-                    'total_rows': field_stats['total_rows'],
-                    'non_null_count': field_stats['non_null_count'],
-                    'null_count': field_stats['null_count'],
-                    'null_percentage': round(field_stats['null_count'] / field_stats['total_rows'] * 100, 2),
-                    'distinct_count': distinct_count,
-                    'distinct_percentage': round(distinct_count / field_stats['non_null_count'] * 100, 2) if field_stats['non_null_count'] > 0 else 0,
-                }
-                
-                # 根据字段类型决定是否枚举值
+            non_null_count = table_stats['non_null_counts'][field_name]
+            if field_name in table_stats['counters']:
+                counter = table_stats['counters'][field_name]
+                distinct_count = len(counter)
+                # 根据字段类型与唯一值数量决定是否枚举值
                 if enumerate_all:
                     # 完整枚举所有值
-                    field_analysis['all_values'] = field_stats['values_distribution']
-                    print(f" [完整枚举]")
+                    mode = '完整枚举'
                 elif enumerate_limited and distinct_count <= 500:
                     # 有限枚举（最多500个）
-                    field_analysis['all_values'] = field_stats['values_distribution']
-                    print(f" [有限枚举]")
+                    mode = '有限枚举'
                 elif distinct_count <= 20:
                     # 值较少，自动枚举
-                    field_analysis['all_values'] = field_stats['values_distribution']
-                    print(f" [自动枚举-值少]")
+                    mode = '自动枚举-值少'
                 else:
                     # 只保留前50个最常见的值
-                    field_analysis['top_50_values'] = field_stats['values_distribution'][:50]
-                    print(f" [仅统计-TOP50]")
-                
-                table_info['field_analysis'][field_name] = field_analysis
+                    mode = '仅统计-TOP50'
+                field_stats = finalize_field_values(counter, row_count, non_null_count,
+                                                    top_n=50 if mode == '仅统计-TOP50' else None)
+            else:
+                # 仅统计字段：不统计唯一值，也不枚举值
+                mode = '仅统计'
+                field_stats = finalize_field_stats(row_count, non_null_count, *table_stats['min_max_sum'][field_name])
+            
+            distinct_count = field_stats['distinct_count']
+            
+            field_analysis = {
+                'data_type': col_info['data_type'],
+                'column_size': col_info['column_size'],
+                'nullable': col_info['nullable'],
+                'total_rows': field_stats['total_rows'],
+                'non_null_count': field_stats['non_null_count'],
+                'null_count': field_stats['null_count'],
+                'null_percentage': round(field_stats['null_count'] / field_stats['total_rows'] * 100, 2),
+                'distinct_count': distinct_count,
+            }
+            
+            if mode == '仅统计':
+                field_analysis['distinct_percentage'] = None
+                field_analysis['min_value'] = field_stats['min_value']
+                field_analysis['max_value'] = field_stats['max_value']
+                field_analysis['numeric_sum'] = field_stats['numeric_sum']
+            else:
+                field_analysis['distinct_percentage'] = round(distinct_count / field_stats['non_null_count'] * 100, 2) if field_stats['non_null_count'] > 0 else 0
+                if mode == '仅统计-TOP50':
+                    field_analysis['top_50_values'] = field_stats['values_distribution']
+                else:
+                    field_analysis['all_values'] = field_stats['values_distribution']
+            
+            table_info['field_analysis'][field_name] = field_analysis
+            
+            # 逐字段进度：每个字段只输出一行，参数延迟格式化（未启用INFO时不格式化）
+            if distinct_count is None:
+                log.info("  ├─ 分析字段: %s [%s]", field_name, mode)
             else:
-                print(f" [错误]: {field_stats['error']}")
+                log.info("  ├─ 分析字段: %s - %s 个唯一值 [%s]", field_name, distinct_count, mode)
         
         # 业务规则校验（仅评估表）
-        rule_checks = perform_rule_checks(conn, table_name, is_assessment=(db_name == 'assessment'))
-        if rule_checks:
-            table_info['rule_checks'] = rule_checks
+        if table_stats['rule_checks']:
+            table_info['rule_checks'] = table_stats['rule_checks']
 
         database_info['tables'][table_name] = table_info
     
@@ -407,6 +520,22 @@ def extract_all_constraints(mdb_path, db_name):
     return database_info
 
 
+def value_percentages(counts, total_rows):
+    """出现次数占总记录数的百分比（NumPy向量化计算，总数为0时全为0）"""
+    counts = np.asarray(counts, dtype=np.int64)
+    if total_rows <= 0:
+        return np.zeros(len(counts))
+    return counts / total_rows * 100
+
+
+def format_value_rows(values_distribution, total_rows):
+    """将值分布格式化为Markdown表格行"""
+    counts = [count for _, count in values_distribution]
+    percentages = value_percentages(counts, total_rows).tolist()
+    return [f"| {value} | {count:,} | {percentage:.2f}% |\n"
+            for (value, count), percentage in zip(values_distribution, percentages)]
+
+
 def save_results(database_info, output_dir='analysis_results'):
     """保存分析结果"""
     output_path = Path(output_dir)
@@ -417,125 +546,176 @@ def save_results(database_info, output_dir='analysis_results'):
     
     # 1. 保存完整的JSON格式
     json_file = output_path / f'{db_name}_完整约束信息_{timestamp}.json'
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(database_info, f, ensure_ascii=False, indent=2)
+    if orjson is not None:
+        # orjson总是输出UTF-8，直接写入字节
+        with open(json_file, 'wb') as f:
+            f.write(orjson.dumps(database_info, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(database_info, f, ensure_ascii=False, indent=2)
     print(f"\n[完成] JSON文件已保存: {json_file}")
     
     # 2. 保存人类可读的Markdown格式
     md_file = output_path / f'{db_name}_字段约束报告_{timestamp}.md'
-    with open(md_file, 'w', encoding='utf-8') as f:
-        f.write(f"# {db_name} 数据库字段约束分析报告\n\n")
-        f.write(f"**数据库路径**: {database_info['mdb_path']}\n\n")
+    # 先在内存中拼接全部内容，最后一次性写入，避免成千上万次小的write调用
+    parts = []
+    parts.append(f"# {db_name} 数据库字段约束分析报告\n\n")
+    parts.append(f"**数据库路径**: {database_info['mdb_path']}\n\n")
+    
+    for table_name, table_info in database_info['tables'].items():
+        parts.append(f"\n## 表: {table_name}\n\n")
+        parts.append(f"- **记录数**: {table_info['row_count']:,}\n")
+        parts.append(f"- **字段数**: {table_info['column_count']}\n\n")
+
+        # 表级约束
+        if 'constraints' in table_info:
+            cons = table_info['constraints']
+            parts.append("### 表级约束\n\n")
+            # 主键
+            if cons.get('primary_keys'):
+                pk_cols = ", ".join([c['column_name'] for c in cons['primary_keys']])
+                parts.append(f"- 主键: {pk_cols}\n")
+            else:
+                parts.append("- 主键: (无/未检测到)\n")
+            # 外键
+            if cons.get('foreign_keys'):
+                parts.append("- 外键:\n")
+                for fk in cons['foreign_keys'][:20]:
+                    parts.append(f"  - {fk['fk_column']} -> {fk['pk_table']}.{fk['pk_column']} (FK: {fk.get('fk_name')})\n")
+                if len(cons['foreign_keys']) > 20:
+                    parts.append(f"  - ... 共 {len(cons['foreign_keys'])} 条\n")
+            else:
+                parts.append("- 外键: (无/未检测到)\n")
+            # 索引
+            if cons.get('indexes'):
+                uniq = [i for i in cons['indexes'] if not i['non_unique']]
+                nonuniq = [i for i in cons['indexes'] if i['non_unique']]
+                parts.append(f"- 唯一索引: {len(uniq)} 个，普通索引: {len(nonuniq)} 个\n\n")
+
+        parts.append("### 字段详细信息\n\n")
         
-        for table_name, table_info in database_info['tables'].items():
-            f.write(f"\n## 表: {table_name}\n\n")
-            f.write(f"- **记录数**: {table_info['row_count']:,}\n")
-            f.write(f"- **字段数**: {table_info['column_count']}\n\n")
-
-            # 表级约束
-            if 'constraints' in table_info:
-                cons = table_info['constraints']
-                f.write("### 表级约束\n\n")
-                # 主键
-                if cons.get('primary_keys'):
-                    pk_cols = ", ".join([c['column_name'] for c in cons['primary_keys']])
-                    f.write(f"- 主键: {pk_cols}\n")
-                else:
-                    f.write("- 主键: (无/未检测到)\n")
-                # 外键
-                if cons.get('foreign_keys'):
-                    f.write("- 外键:\n")
-                    for fk in cons['foreign_keys'][:20]:
-                        f.write(f"  - {fk['fk_column']} -> {fk['pk_table']}.{fk['pk_column']} (FK: {fk.get('fk_name')})\n")
-                    if len(cons['foreign_keys']) > 20:
-                        f.write(f"  - ... 共 {len(cons['foreign_keys'])} 条\n")
-                else:
-                    f.write("- 外键: (无/未检测到)\n")
-                # 索引
-                if cons.get('indexes'):
-                    uniq = [i for i in cons['indexes'] if not i['non_unique']]
-                    nonuniq = [i for i in cons['indexes'] if i['non_unique']]
-                    f.write(f"- 唯一索引: {len(uniq)} 个，普通索引: {len(nonuniq)} 个\n\n")
-
-            f.write("### 字段详细信息\n\n")
+        # 字段名 -> 结构信息，避免每个字段线性查找schema
+        schema_by_col = {c['column_name']: c for c in table_info['schema']}
+        
+        for field_name, field_analysis in table_info['field_analysis'].items():
+            parts.append(f"\n#### 字段: `{field_name}`\n\n")
+            parts.append(f"**基本信息**:\n")
+            parts.append(f"- 数据类型: `{field_analysis['data_type']}`\n")
+            parts.append(f"- 字段大小: {field_analysis['column_size']}\n")
+            parts.append(f"- 允许空值: {'是' if field_analysis['nullable'] else '否'}\n\n")
+            # 默认值与备注
+            col = schema_by_col.get(field_name)
+            if col:
+                if col.get('default') is not None:
+                    parts.append(f"- 默认值: {col['default']}\n")
+                if col.get('remarks'):
+                    parts.append(f"- 备注: {col['remarks']}\n")
             
-            for field_name, field_analysis in table_info['field_analysis'].items():
-                f.write(f"\n#### 字段: `{field_name}`\n\n")
-                f.write(f"**基本信息**:\n")
-                f.write(f"- 数据类型: `{field_analysis['data_type']}`\n")
-                f.write(f"- 字段大小: {field_analysis['column_size']}\n")
-                f.write(f"- 允许空值: {'是' if field_analysis['nullable'] else '否'}\n\n")
-                # 默认值与备注
-                for col in table_info['schema']:
-                    if col['column_name'] == field_name:
-                        if col.get('default') is not None:
-                            f.write(f"- 默认值: {col['default']}\n")
-                        if col.get('remarks'):
-                            f.write(f"- 备注: {col['remarks']}\n")
-                        break
-                
-                f.write(f"**统计信息**:\n")
-                f.write(f"- 总记录数: {field_analysis['total_rows']:,}\n")
-                f.write(f"- 非空记录数: {field_analysis['non_null_count']:,}\n")
-                f.write(f"- 空值数量: {field_analysis['null_count']:,} ({field_analysis['null_percentage']}%)\n")
-                # 唯一值数量的百分比说明：表示值的多样性（多样性 = 唯一值数/非空记录数）
-                # 0.01%表示值非常集中（几乎都是重复值），100%表示每个值都不同
+            parts.append(f"**统计信息**:\n")
+            parts.append(f"- 总记录数: {field_analysis['total_rows']:,}\n")
+            parts.append(f"- 非空记录数: {field_analysis['non_null_count']:,}\n")
+            parts.append(f"- 空值数量: {field_analysis['null_count']:,} ({field_analysis['null_percentage']}%)\n")
+            # 唯一值数量的百分比说明：表示值的多样性（多样性 = 唯一值数/非空记录数）
+            # 0.01%表示值非常集中（几乎都是重复值），100%表示每个值都不同
+            if field_analysis['distinct_count'] is None:
+                # 仅统计字段：输出最小/最大值与数值合计
+                parts.append(f"- 最小值: {field_analysis['min_value']}\n")
+                parts.append(f"- 最大值: {field_analysis['max_value']}\n")
+                parts.append(f"- 数值合计: {field_analysis['numeric_sum']}\n")
+                parts.append("- 唯一值数量: (仅统计字段，未计算)\n\n")
+            else:
                 distinct_pct_explanation = f" ({field_analysis['distinct_percentage']}% - 值多样性指标，非覆盖率)"
-                f.write(f"- 唯一值数量: {field_analysis['distinct_count']:,}{distinct_pct_explanation}\n\n")
-                
-                # 枚举值
-                if 'all_values' in field_analysis:
-                    f.write(f"**所有可能的值** (共 {len(field_analysis['all_values'])} 个):\n\n")
-                    f.write("| 值 | 出现次数 | 占总记录百分比 |\n")
-                    f.write("|---|---|---|\n")
-                    for value, count in field_analysis['all_values']:
-                        # 统一使用总记录数作为分母，避免NULL值导致百分比超过100%
-                        percentage = count / field_analysis['total_rows'] * 100 if field_analysis['total_rows'] > 0 else 0
-                        f.write(f"| {value} | {count:,} | {percentage:.2f}% |\n")
-                elif 'top_50_values' in field_analysis:
-                    f.write(f"**前50个最常见的值**:\n\n")
-                    f.write("| 值 | 出现次数 | 占总记录百分比 |\n")
-                    f.write("|---|---|---|\n")
-                    for value, count in field_analysis['top_50_values']:
-                        # 统一使用总记录数作为分母
-                        percentage = count / field_analysis['total_rows'] * 100 if field_analysis['total_rows'] > 0 else 0
-                        f.write(f"| {value} | {count:,} | {percentage:.2f}% |\n")
-                
-                f.write("\n---\n")
-
-            # 规则校验
-            if 'rule_checks' in table_info and table_info['rule_checks']:
-                f.write("\n### 规则校验\n\n")
-                rc = table_info['rule_checks']
-                if rc.get('levels_sum_check'):
-                    s = rc['levels_sum_check']
-                    f.write(f"- Levels求和一致性: 异常 {s['mismatch_rows']:,} / {s['total_rows']:,} ({s['mismatch_percentage']}%)\n")
-                if rc.get('ap_proficient_check'):
-                    s = rc['ap_proficient_check']
-                    f.write(f"- AP达标一致性: 异常 {s['mismatch_rows']:,} / {s['total_rows']:,} ({s['mismatch_percentage']}%)\n")
-                if rc.get('ib_proficient_check'):
-                    s = rc['ib_proficient_check']
-                    f.write(f"- IB达标一致性: 异常 {s['mismatch_rows']:,} / {s['total_rows']:,} ({s['mismatch_percentage']}%)\n")
+                parts.append(f"- 唯一值数量: {field_analysis['distinct_count']:,}{distinct_pct_explanation}\n\n")
+            
+            # 枚举值
+            if 'all_values' in field_analysis:
+                parts.append(f"**所有可能的值** (共 {len(field_analysis['all_values'])} 个):\n\n")
+                parts.append("| 值 | 出现次数 | 占总记录百分比 |\n")
+                parts.append("|---|---|---|\n")
+                # 统一使用总记录数作为分母，避免NULL值导致百分比超过100%
+                parts.extend(format_value_rows(field_analysis['all_values'], field_analysis['total_rows']))
+            elif 'top_50_values' in field_analysis:
+                parts.append(f"**前50个最常见的值**:\n\n")
+                parts.append("| 值 | 出现次数 | 占总记录百分比 |\n")
+                parts.append("|---|---|---|\n")
+                # 统一使用总记录数作为分母
+                parts.extend(format_value_rows(field_analysis['top_50_values'], field_analysis['total_rows']))
+            
+            parts.append("\n---\n")
+
+        # 规则校验
+        if 'rule_checks' in table_info and table_info['rule_checks']:
+            parts.append("\n### 规则校验\n\n")
+            rc = table_info['rule_checks']
+            if rc.get('levels_sum_check'):
+                s = rc['levels_sum_check']
+                parts.append(f"- Levels求和一致性: 异常 {s['mismatch_rows']:,} / {s['total_rows']:,} ({s['mismatch_percentage']}%)\n")
+            if rc.get('ap_proficient_check'):
+                s = rc['ap_proficient_check']
+                parts.append(f"- AP达标一致性: 异常 {s['mismatch_rows']:,} / {s['total_rows']:,} ({s['mismatch_percentage']}%)\n")
+            if rc.get('ib_proficient_check'):
+                s = rc['ib_proficient_check']
+                parts.append(f"- IB达标一致性: 异常 {s['mismatch_rows']:,} / {s['total_rows']:,} ({s['mismatch_percentage']}%)\n")
+    
+    with open(md_file, 'w', encoding='utf-8') as f:
+        f.write(''.join(parts))
     
     print(f"[完成] Markdown报告已保存: {md_file}")
     
     # 3. 单独保存关键字段的完整枚举值（CSV格式）
     for table_name, table_info in database_info['tables'].items():
-        for field_name in FIELDS_TO_ENUMERATE_COMPLETELY:
-            if field_name in table_info['field_analysis']:
-                field_data = table_info['field_analysis'][field_name]
-                if 'all_values' in field_data:
-                    csv_file = output_path / f'{db_name}_{table_name}_{field_name}_完整枚举值.csv'
-                    df = pd.DataFrame(field_data['all_values'], columns=['值', '出现次数'])
-                    # 使用总记录数作为分母计算百分比，避免NULL值导致问题
-                    total_rows = field_data['total_rows']
-                    df['占总记录百分比'] = (df['出现次数'] / total_rows * 100).round(2)
-                    df.to_csv(csv_file, index=False, encoding='utf-8-sig')
-                    print(f"[完成] 字段枚举CSV已保存: {csv_file}")
+        for field_name, field_data in table_info['field_analysis'].items():
+            if in_field_list(field_name, FIELDS_TO_ENUMERATE_COMPLETELY) and 'all_values' in field_data:
+                csv_file = output_path / f'{db_name}_{table_name}_{field_name}_完整枚举值.csv'
+                all_values = field_data['all_values']
+                values = [value for value, _ in all_values]
+                counts = np.fromiter((count for _, count in all_values), dtype=np.int64, count=len(all_values))
+                # 使用总记录数作为分母计算百分比，避免NULL值导致问题
+                percentages = np.round(value_percentages(counts, field_data['total_rows']), 2)
+                with open(csv_file, 'w', encoding='utf-8-sig', newline='') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(['值', '出现次数', '占总记录百分比'])
+                    writer.writerows(zip(values, counts.tolist(), percentages.tolist()))
+                print(f"[完成] 字段枚举CSV已保存: {csv_file}")
+
+
+class BufferedStreamHandler(logging.StreamHandler):
+    """写入后不立即flush的StreamHandler
+    
+    标准StreamHandler每条记录都会flush，会抵消stdout的块缓冲；
+    这里只写入，由表边界处的显式flush统一刷新。
+    """
+
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+def setup_logging(level=logging.INFO):
+    """进度日志输出到标准输出（主进程与进程池的工作进程都需调用）
+    
+    行首带进程名；工作进程以数据库名命名，便于区分并行输出。
+    """
+    logging.basicConfig(level=level, format='[%(processName)s] %(message)s',
+                        handlers=[BufferedStreamHandler(sys.stdout)])
+
+
+def extract_and_save(db_name, mdb_path):
+    """分析单个数据库并保存结果（供进程池调用，须为模块级函数）"""
+    # 以数据库名作为进程名，日志中的%(processName)s即可区分两个数据库
+    multiprocessing.current_process().name = db_name
+    database_info = extract_all_constraints(mdb_path, db_name)
+    if not database_info:
+        return False
+    save_results(database_info)
+    return True
 
 
 def main():
     """主函数"""
+    setup_logging()
     print("="*80)
     print("MDB数据库字段约束提取工具")
     print("="*80)
@@ -543,17 +723,27 @@ def main():
     print(f"   - 需要完整枚举的字段: {len(FIELDS_TO_ENUMERATE_COMPLETELY)} 个")
     print(f"   - 关键字段: {', '.join(FIELDS_TO_ENUMERATE_COMPLETELY[:6])}...")
     
-    all_results = {}
-    
+    existing_files = {}
     for db_name, mdb_path in MDB_FILES.items():
         if not Path(mdb_path).exists():
             print(f"\n[错误] 文件不存在: {mdb_path}")
             continue
-        
-        database_info = extract_all_constraints(mdb_path, db_name)
-        if database_info:
-            all_results[db_name] = database_info
-            save_results(database_info)
+        existing_files[db_name] = mdb_path
+    
+    # 两个数据库相互独立且都受ODBC读取限制，分别在独立进程中分析（各自持有连接）
+    if existing_files:
+        with ProcessPoolExecutor(max_workers=len(existing_files), initializer=setup_logging) as executor:
+            futures = {
+                executor.submit(extract_and_save, db_name, mdb_path): db_name
+                for db_name, mdb_path in existing_files.items()
+            }
+            for future in as_completed(futures):
+                db_name = futures[future]
+                try:
+                    if not future.result():
+                        print(f"\n[错误] {db_name} 分析失败")
+                except Exception as e:
+                    print(f"\n[错误] {db_name} 分析异常: {e}")
     
     print("\n" + "="*80)
     print("[完成] 所有分析完成！")